@@ -8,10 +8,9 @@ configure_page()
 from src.utils.cache import (
     get_data,
     get_model,
+    get_features,
 )
 
-from src.data.preprocessing import engineer_features
-
 from src.visualization.model import (
     plot_actual_vs_predicted,
     plot_residuals,
@@ -56,7 +55,7 @@ st.caption(
 # Feature Engineering and Recreating Test Set
 # ================================================================
 
-D = engineer_features(df)
+D = get_features(df)
 
 train_mask = D["iyear"] <= 2018
 
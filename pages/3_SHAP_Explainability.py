@@ -6,11 +6,10 @@ import streamlit as st
 from src.utils.page_width import configure_page
 configure_page()
 
-from src.data.preprocessing import engineer_features
-
 from src.utils.cache import (
     get_data,
     get_model,
+    get_features,
     get_shap,
 )
 
@@ -56,7 +55,7 @@ with st.spinner("Loading XGBoost model..."):
 # Feature Engineering
 # ================================================================
 
-D = engineer_features(df)
+D = get_features(df)
 
 # ================================================================
 # Test Data
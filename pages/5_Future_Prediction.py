@@ -17,6 +17,8 @@ from src.utils.cache import (
     get_data,
     get_model,
     get_countries,
+    get_prediction,
+    get_feature_maps,
 )
 
 from src.models.predictor import predict_and_map
@@ -68,15 +70,22 @@ deterministic = st.sidebar.checkbox("Deterministic Prediction",value=True,
 # Prediction
 # ================================================================
 
+# Deterministic maps are cached per parameter set; random samples are not.
+# The map HTML and CSV are serialized once and reused for display, export and download.
 with st.spinner("Generating prediction map..."):
-    fmap, pred_df = predict_and_map(df,model,features,future_year,sample_size,country_filter,deterministic,)
+    if deterministic:
+        map_html, pred_df, csv = get_prediction(df,model,features,future_year,sample_size,tuple(country_filter),)
+    else:
+        fmap, pred_df = predict_and_map(df,model,features,future_year,sample_size,country_filter,deterministic,feature_maps=get_feature_maps(df),)
+        map_html = fmap.get_root().render()
+        csv = pred_df.to_csv(index=False).encode("utf-8")
 
 # ================================================================
 # Map
 # ================================================================
 
 st.markdown(f"### 🌍 Severity Risk Map — {future_year}")
-st.components.v1.html(fmap._repr_html_(),height=650,)
+st.components.v1.html(map_html,height=650,)
 
 # ================================================================
 # Download Map
@@ -85,9 +94,9 @@ st.components.v1.html(fmap._repr_html_(),height=650,)
 EXPORT_MAP_DIR.mkdir(parents=True, exist_ok=True)
 out_path = EXPORT_MAP_DIR / f"gtd_predicted_map_{future_year}.html"
 
-fmap.save(out_path)
-with open(out_path, "rb") as f:
-    st.download_button("⬇️ Download Map HTML",f,file_name=os.path.basename(out_path),mime="text/html",)
+map_bytes = map_html.encode("utf-8")
+out_path.write_bytes(map_bytes)
+st.download_button("⬇️ Download Map HTML",map_bytes,file_name=os.path.basename(out_path),mime="text/html",)
 
 # ================================================================
 # Prediction Table
@@ -104,7 +113,6 @@ st.caption(f"Showing the first 15 predictions out of {len(pred_df):,} generated
 # Download Prediction Dataset
 # ================================================================
 
-csv = pred_df.to_csv(index=False).encode("utf-8")
 st.download_button(label="⬇️ Download Complete Prediction Dataset (CSV)",data=csv,file_name=f"terrorism_predictions_{future_year}_{len(pred_df)}_samples.csv",mime="text/csv",)
 
 # Footer
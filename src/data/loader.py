@@ -28,11 +28,30 @@ def load_data():
         "nwound",
     ]
 
+    # Explicit dtypes keep the C parser on its fast path (no low_memory
+    # type inference). Text columns stay object: categoricals would leak
+    # unused categories into value_counts()/seaborn plots. Casualty counts
+    # stay float64 so the group means match what the saved model was trained on.
+    dtypes = {
+        "iyear": "int16",
+        "imonth": "int8",
+        "region": "int8",
+        "country": "int16",
+        "latitude": "float64",
+        "longitude": "float64",
+        "attacktype1": "int8",
+        "targtype1": "int8",
+        "weaptype1": "int8",
+        "success": "int8",
+        "nkill": "float64",
+        "nwound": "float64",
+    }
+
     df = pd.read_csv(
         DATA_PATH,
         usecols=cols,
+        dtype=dtypes,
         encoding="ISO-8859-1",
-        low_memory=False,
     )
 
     df["nkill"] = df["nkill"].fillna(0)
@@ -39,8 +39,15 @@ def engineer_features(df):
     D = D.sort_values(["country","iyear"])
     D["country_5yr_mean"] = (
         D.groupby("country")["total_casualties"]
-         .transform(lambda x: x.rolling(5, min_periods=1).mean())
+         .rolling(5, min_periods=1).mean()
+         .reset_index(level=0, drop=True)
     )
     D["country_5yr_mean"] = np.log1p(D["country_5yr_mean"])
 
+    # XGBoost casts inputs to float32 internally. This matches that cast only
+    # because the sums/means above are computed from float64 inputs (see
+    # load_data); computing them in float32 would shift split-boundary values.
+    float_features = [c for c in D.columns if c.endswith(("_freq", "_mean"))] + ["year_trend"]
+    D[float_features] = D[float_features].astype(np.float32)
+
     return D
@@ -7,16 +7,43 @@ import folium
 from src.config import ATTACK_COLORS
 
 
+# ================================================================
+# Full-dataset lookup maps
+# ================================================================
+
+def build_feature_maps(df):
+    # Frequency / mean encodings depend only on the full dataset, not on
+    # the sample, so they can be built once and reused across predictions.
+    maps = {}
+    for col in ["region", "country", "attacktype1", "targtype1", "weaptype1"]:
+        maps[col + "_freq"] = df[col].value_counts().to_dict()
+
+    maps["region_attack_freq"] = (df["region"].astype(str) + "_" + df["attacktype1"].astype(str)).value_counts().to_dict()
+
+    maps["region_mean"] = df.groupby("region")["total_casualties"].mean().to_dict()
+    maps["attack_mean"] = df.groupby("attacktype1")["total_casualties"].mean().to_dict()
+    maps["country_mean"] = df.groupby("country")["total_casualties"].mean().to_dict()
+
+    maps["year_min"] = df["iyear"].min()
+    maps["year_max"] = df["iyear"].max()
+
+    return maps
+
+
 # ================================================================
 # Prediction + Folium Map
 # ================================================================
 
-def predict_and_map(df, model, features, future_year, sample_size=300, country_filter=None, deterministic=True):
-    D = df.copy()
+def predict_and_map(df, model, features, future_year, sample_size=300, country_filter=None, deterministic=True, feature_maps=None):
+    if feature_maps is None:
+        feature_maps = build_feature_maps(df)
+
+    # Only the sampled rows are copied below; filtering the full frame needs no copy.
+    D = df
     if country_filter:
-        D = D[D["country_txt"].isin(country_filter)]
+        D = df[df["country_txt"].isin(country_filter)]
         if D.empty:
-            D = df.copy()
+            D = df
 
     if deterministic:                                                                   # When enabled, the same year always produces the same prediction map.
         sample = D.sample(n=min(sample_size, len(D)),random_state=future_year,).copy()  # Disable for a different random sample on each run.       
@@ -32,40 +59,34 @@ def predict_and_map(df, model, features, future_year, sample_size=300, country_f
 
     # recreate frequency/interactions using whole df
     for col in ["region", "country", "attacktype1", "targtype1", "weaptype1"]:
-        freq = df[col].value_counts().to_dict()
-        sample[col + "_freq"] = sample[col].map(freq).fillna(0).astype(float)
+        sample[col + "_freq"] = sample[col].map(feature_maps[col + "_freq"]).fillna(0).astype(float)
 
     # Interaction frequency (map)
-    region_attack_freq_map = (df["region"].astype(str) + "_" + df["attacktype1"].astype(str)).value_counts().to_dict()
     sample["region_attack"] = sample["region"].astype(str) + "_" + sample["attacktype1"].astype(str)
-    sample["region_attack_freq"] = sample["region_attack"].map(region_attack_freq_map).fillna(0).astype(float)
+    sample["region_attack_freq"] = sample["region_attack"].map(feature_maps["region_attack_freq"]).fillna(0).astype(float)
 
     # Historical means: use mapping to avoid misalignment
-    region_mean_map = df.groupby("region")["total_casualties"].mean().to_dict()
-    attack_mean_map = df.groupby("attacktype1")["total_casualties"].mean().to_dict()
-    country_mean_map = df.groupby("country")["total_casualties"].mean().to_dict()
-
-    sample["region_mean"]  = np.log1p(sample["region"].map(region_mean_map).fillna(0).astype(float))
-    sample["attack_mean"]  = np.log1p(sample["attacktype1"].map(attack_mean_map).fillna(0).astype(float))
-    sample["country_mean"] = np.log1p(sample["country"].map(country_mean_map).fillna(0).astype(float))
+    sample["region_mean"]  = np.log1p(sample["region"].map(feature_maps["region_mean"]).fillna(0).astype(float))
+    sample["attack_mean"]  = np.log1p(sample["attacktype1"].map(feature_maps["attack_mean"]).fillna(0).astype(float))
+    sample["country_mean"] = np.log1p(sample["country"].map(feature_maps["country_mean"]).fillna(0).astype(float))
 
     # Category codes (on sample)
     for col in ["region", "country", "attacktype1", "targtype1", "weaptype1"]:
         sample[col + "_cat"] = sample[col].astype("category").cat.codes
 
     # Year trend relative to original df
-    sample["year_trend"] = (future_year - df["iyear"].min()) / max(1, (df["iyear"].max() - df["iyear"].min()))
+    sample["year_trend"] = (future_year - feature_maps["year_min"]) / max(1, (feature_maps["year_max"] - feature_maps["year_min"]))
 
     # Rolling country 5-year mean (on sample) — use sample grouping (safe)
     sample = sample.sort_values(["country", "iyear"])
     sample["country_5yr_mean"] = (
-        sample.groupby("country")["total_casualties"].transform(lambda x: x.rolling(5, min_periods=1).mean())
+        sample.groupby("country")["total_casualties"].rolling(5, min_periods=1).mean().reset_index(level=0, drop=True)
     )
     sample["country_5yr_mean"] = np.log1p(sample["country_5yr_mean"].fillna(0))
 
     # Predict
     if model is None:
-        sample["predicted_casualties"] = sample["country_mean"].apply(lambda v: np.expm1(v) if pd.notnull(v) else 0)
+        sample["predicted_casualties"] = np.expm1(sample["country_mean"].fillna(0))
     else:
         try:
             pred_log = model.predict(sample[features])
@@ -73,23 +94,29 @@ def predict_and_map(df, model, features, future_year, sample_size=300, country_f
         except Exception:
             print("⚠️ Model prediction failed; falling back to country_mean.")
             print(traceback.format_exc())
-            sample["predicted_casualties"] = sample["country_mean"].apply(lambda v: np.expm1(v) if pd.notnull(v) else 0)
+            sample["predicted_casualties"] = np.expm1(sample["country_mean"].fillna(0))
 
     # Build folium map
     fmap = folium.Map(location=[sample["latitude"].mean(), sample["longitude"].mean()], zoom_start=2)
-    for _, row in sample.iterrows():
-        try:
-            attack_idx = int(row.get("attacktype1", 0)) if not pd.isna(row.get("attacktype1", None)) else 0
-        except Exception:
-            attack_idx = 0
+
+    # Per-marker values computed column-wise instead of per row via iterrows()
+    predicted = sample["predicted_casualties"].to_numpy(dtype=float)
+    radii = 3 + np.sqrt(np.clip(predicted, 0, None))
+    colors = sample["attacktype1"].fillna(0).astype(int).map(ATTACK_COLORS).fillna("gray")
+    attack_txt = sample["attacktype1_txt"] if "attacktype1_txt" in sample else pd.Series("unknown", index=sample.index)
+
+    for lat, lon, radius, color, country, attack, pred in zip(
+        sample["latitude"].to_numpy(), sample["longitude"].to_numpy(), radii, colors.to_numpy(),
+        sample["country_txt"].to_numpy(), attack_txt.to_numpy(), predicted,
+    ):
         folium.CircleMarker(
-            location=[row["latitude"], row["longitude"]],
-            radius=3 + np.sqrt(max(0, float(row["predicted_casualties"]))),
-            color=ATTACK_COLORS.get(attack_idx, 'gray'),
+            location=[lat, lon],
+            radius=radius,
+            color=color,
             fill=True, fill_opacity=0.6,
-            popup=(f"<b>Country:</b> {row['country_txt']}<br>"
-                   f"<b>Attack Type:</b> {row.get('attacktype1_txt', 'unknown')}<br>"
-                   f"<b>Predicted Casualties:</b> {int(row['predicted_casualties'])}")
+            popup=(f"<b>Country:</b> {country}<br>"
+                   f"<b>Attack Type:</b> {attack}<br>"
+                   f"<b>Predicted Casualties:</b> {int(pred)}")
         ).add_to(fmap)
 
     fmap.get_root().html.add_child(folium.Element("""
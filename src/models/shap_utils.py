@@ -1,8 +1,8 @@
-import shap
-import streamlit as st
-
 def compute_shap(_model,X):
 
+    # shap pulls in numba/scipy on import; only load it when explanations are requested.
+    import shap
+
     explainer = shap.TreeExplainer(_model)
     shap_values = explainer.shap_values(X)
 
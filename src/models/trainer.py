@@ -7,18 +7,6 @@ import pandas as pd
 
 from datetime import datetime
 
-from sklearn.metrics import (
-    r2_score,
-    mean_absolute_error,
-    mean_squared_error,
-    accuracy_score,
-    precision_score,
-    recall_score,
-    f1_score,
-)
-
-from xgboost import XGBRegressor
-
 from src.config import (
     MODEL_DIR,
     MODEL_PATH,
@@ -39,6 +27,20 @@ def train_xgboost_cpu(df):
     Saves model to disk for future runs.
     """
 
+    # Imported here so pages that only need the dataset (e.g. Home) do not
+    # pay for loading xgboost/scikit-learn through src.utils.cache.
+    from sklearn.metrics import (
+        r2_score,
+        mean_absolute_error,
+        mean_squared_error,
+        accuracy_score,
+        precision_score,
+        recall_score,
+        f1_score,
+    )
+
+    from xgboost import XGBRegressor
+
     os.makedirs(MODEL_DIR, exist_ok=True)
 
     # -------------------------------------------------
@@ -1,9 +1,11 @@
 import streamlit as st
 
 from src.data.loader import load_data
+from src.data.preprocessing import engineer_features
 from src.models.trainer import train_xgboost_cpu
 from src.models.shap_utils import compute_shap
 from src.models.metrics import load_model_comparison
+from src.models.predictor import predict_and_map, build_feature_maps
 
 
 # ================================================================
@@ -15,6 +17,17 @@ def get_data():
     return load_data()
 
 
+# ================================================================
+# Engineered Features
+# ================================================================
+
+# cache_resource: both pages only read the frame, so share it instead of
+# unpickling a fresh copy on every rerun.
+@st.cache_resource(show_spinner=False)
+def get_features(_df):
+    return engineer_features(_df)
+
+
 # ================================================================
 # Model
 # ================================================================
@@ -41,6 +54,27 @@ def get_shap(_model, _X):
 def get_model_comparison():
     return load_model_comparison()
 
+# ================================================================
+# Prediction Lookup Maps
+# ================================================================
+
+@st.cache_data(show_spinner=False)
+def get_feature_maps(_df):
+    return build_feature_maps(_df)
+
+
+# ================================================================
+# Future Prediction
+# ================================================================
+
+@st.cache_data(show_spinner=False, max_entries=16, ttl=3600)
+def get_prediction(_df, _model, features, future_year, sample_size, country_filter):
+    # Deterministic runs only: the sample is seeded by future_year, so the
+    # rendered map, predictions and CSV export are fully determined by these params.
+    # Entries hold the map HTML + CSV (a few MB at SIZE_MAX), so keep the bound small.
+    fmap, pred_df = predict_and_map(_df, _model, features, future_year, sample_size, list(country_filter), deterministic=True, feature_maps=get_feature_maps(_df))
+    return fmap.get_root().render(), pred_df, pred_df.to_csv(index=False).encode("utf-8")
+
 # ================================================================
 # Country List
 # ================================================================